@@ -11,79 +11,78 @@ import {
   ShieldCheck,
   QrCode,
   MapPin,
-  Clock,
-  AlertCircle
+  Clock
 } from "lucide-react";
 import blockchainNetwork from "@/assets/blockchain-network.jpg";
 
-export const Dashboard = () => {
-  const stakeholders = [
-    {
-      type: "Farmer",
-      icon: <Tractor className="h-6 w-6" />,
-      count: "1,247",
-      description: "Registered farmers tracking their produce",
-      color: "bg-farm-primary"
-    },
-    {
-      type: "Distributor",
-      icon: <Package className="h-6 w-6" />,
-      description: "Distribution partners in the network",
-      count: "89",
-      color: "bg-blockchain-blue"
-    },
-    {
-      type: "Retailer",
-      icon: <Store className="h-6 w-6" />,
-      count: "312",
-      description: "Retail outlets providing verified produce",
-      color: "bg-trust-green"
-    },
-    {
-      type: "Consumer",
-      icon: <User className="h-6 w-6" />,
-      count: "45K+",
-      description: "Active consumers verifying their food",
-      color: "bg-harvest-amber"
-    }
-  ];
+const stakeholders = [
+  {
+    type: "Farmer",
+    icon: <Tractor className="h-6 w-6" />,
+    count: "1,247",
+    description: "Registered farmers tracking their produce",
+    color: "bg-farm-primary"
+  },
+  {
+    type: "Distributor",
+    icon: <Package className="h-6 w-6" />,
+    description: "Distribution partners in the network",
+    count: "89",
+    color: "bg-blockchain-blue"
+  },
+  {
+    type: "Retailer",
+    icon: <Store className="h-6 w-6" />,
+    count: "312",
+    description: "Retail outlets providing verified produce",
+    color: "bg-trust-green"
+  },
+  {
+    type: "Consumer",
+    icon: <User className="h-6 w-6" />,
+    count: "45K+",
+    description: "Active consumers verifying their food",
+    color: "bg-harvest-amber"
+  }
+];
+
+const recentTransactions = [
+  {
+    id: "TXN001",
+    product: "Organic Tomatoes",
+    farm: "Green Valley Farm",
+    status: "In Transit",
+    location: "Processing Center → Retail",
+    timestamp: "2 hours ago"
+  },
+  {
+    id: "TXN002", 
+    product: "Fresh Lettuce",
+    farm: "Sunrise Organic",
+    status: "Delivered",
+    location: "Fresh Market Store",
+    timestamp: "4 hours ago"
+  },
+  {
+    id: "TXN003",
+    product: "Heritage Wheat",
+    farm: "Prairie Fields",
+    status: "Harvested",
+    location: "Farm Storage",
+    timestamp: "6 hours ago"
+  }
+];
 
-  const recentTransactions = [
-    {
-      id: "TXN001",
-      product: "Organic Tomatoes",
-      farm: "Green Valley Farm",
-      status: "In Transit",
-      location: "Processing Center → Retail",
-      timestamp: "2 hours ago"
-    },
-    {
-      id: "TXN002", 
-      product: "Fresh Lettuce",
-      farm: "Sunrise Organic",
-      status: "Delivered",
-      location: "Fresh Market Store",
-      timestamp: "4 hours ago"
-    },
-    {
-      id: "TXN003",
-      product: "Heritage Wheat",
-      farm: "Prairie Fields",
-      status: "Harvested",
-      location: "Farm Storage",
-      timestamp: "6 hours ago"
-    }
-  ];
+// Transaction status -> badge color; anything unlisted renders muted
+const STATUS_COLORS: Record<string, string> = {
+  "Delivered": "bg-trust-green",
+  "In Transit": "bg-blockchain-blue",
+  "Harvested": "bg-harvest-amber",
+};
 
-  const getStatusColor = (status: string) => {
-    switch (status) {
-      case "Delivered": return "bg-trust-green";
-      case "In Transit": return "bg-blockchain-blue";
-      case "Harvested": return "bg-harvest-amber";
-      default: return "bg-muted";
-    }
-  };
+const getStatusColor = (status: string) => STATUS_COLORS[status] ?? "bg-muted";
 
+export const Dashboard = () => {
   return (
     <section id="dashboard" className="py-24 bg-background">
       <div className="container mx-auto px-4">
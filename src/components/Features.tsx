@@ -1,15 +1,12 @@
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { 
-  Leaf, 
   QrCode, 
   Shield, 
   TrendingUp, 
   Users, 
   MapPin,
   Clock,
-  Award,
-  BarChart3,
   ArrowRight
 } from "lucide-react";
 import { Link } from "react-router-dom";
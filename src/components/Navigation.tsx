@@ -1,5 +1,5 @@
 import { Button } from "@/components/ui/button";
-import { Leaf, ShieldCheck, Truck, QrCode, Menu, X, ChevronDown, User, LogOut } from "lucide-react";
+import { Leaf, Menu, X, ChevronDown, User, LogOut } from "lucide-react";
 import { useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import { useAuth } from "@/contexts/AuthContext";
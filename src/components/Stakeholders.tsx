@@ -10,8 +10,7 @@ import {
   Star,
   MapPin,
   Calendar,
-  ShieldCheck,
-  TrendingUp
+  ShieldCheck
 } from "lucide-react";
 
 export const Stakeholders = () => {
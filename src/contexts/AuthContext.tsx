@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useEffect, useState } from 'react'
+import React, { createContext, useContext, useEffect, useRef, useState } from 'react'
 import { User, Session, AuthError } from '@supabase/supabase-js'
 import { supabase } from '@/integrations/supabase/client'
 
@@ -34,6 +34,12 @@ interface AuthContextType {
 
 const AuthContext = createContext<AuthContextType | undefined>(undefined)
 
+// Exactly the UserProfile fields, rather than every column of the row
+const PROFILE_COLUMNS = 'id, first_name, last_name, email, role, phone, address, created_at, updated_at'
+
+// How long a fetched profile is reused across auth events for the same user
+const PROFILE_CACHE_TTL_MS = 60 * 1000
+
 export const useAuth = () => {
   const context = useContext(AuthContext)
   if (context === undefined) {
@@ -53,6 +59,9 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   const [userRole, setUserRole] = useState<UserRole | null>(null)
   const [loading, setLoading] = useState(true)
   const [profileLoading, setProfileLoading] = useState(false)
+  // Last profile fetch (in flight or settled), so INITIAL_SESSION / TOKEN_REFRESHED for the
+  // same user, including back-to-back events, don't each re-query the profiles table
+  const profileCache = useRef<{ userId: string; profile: Promise<UserProfile | null>; expires: number } | null>(null)
 
   // Fetch user profile from Supabase
   const fetchProfile = async (userId: string): Promise<UserProfile | null> => {
@@ -62,7 +71,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       
       const { data, error } = await supabase
         .from('profiles')
-        .select('*')
+        .select(PROFILE_COLUMNS)
         .eq('user_id', userId)
         .single()
 
@@ -81,6 +90,20 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
     }
   }
 
+  // Profile for userId, sharing a pending or recent fetch instead of starting another
+  const loadProfile = (userId: string): Promise<UserProfile | null> => {
+    const cached = profileCache.current
+    if (cached && cached.userId === userId && cached.expires > Date.now()) return cached.profile
+
+    const entry = { userId, profile: fetchProfile(userId), expires: Date.now() + PROFILE_CACHE_TTL_MS }
+    profileCache.current = entry
+    entry.profile.then((userProfile) => {
+      // Failed fetches aren't reused; the next auth event retries
+      if (!userProfile && profileCache.current === entry) profileCache.current = null
+    })
+    return entry.profile
+  }
+
   // Handle auth state changes
   const handleAuthStateChange = async (event: string, session: Session | null) => {
     console.log('Auth state change:', event, session?.user?.id)
@@ -95,7 +118,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
         setUserRole(metaRole)
       }
       // Fetch full profile in background and refine role
-      fetchProfile(session.user.id)
+      loadProfile(session.user.id)
         .then((userProfile) => {
           setProfile(userProfile)
           if (userProfile?.role) setUserRole(userProfile.role)
@@ -103,6 +126,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
         .catch((err) => console.error('Profile fetch error:', err))
     } else {
       // User is not authenticated, clear profile
+      profileCache.current = null
       setProfile(null)
       setUserRole(null)
     }
@@ -173,8 +197,9 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       
       if (error) throw error
       
-      // Refresh the profile after update
-      const updatedProfile = await fetchProfile(user.id)
+      // Refresh the profile after update, dropping the now-stale cached copy
+      profileCache.current = null
+      const updatedProfile = await loadProfile(user.id)
       setProfile(updatedProfile)
       setUserRole(updatedProfile?.role || null)
       
@@ -198,6 +223,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       await supabase.auth.signOut()
     } finally {
       // Proactively clear local auth state to avoid UI flashes
+      profileCache.current = null
       setSession(null)
       setUser(null)
       setProfile(null)
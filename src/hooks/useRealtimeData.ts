@@ -2,23 +2,43 @@ import { useEffect, useState } from 'react';
 import { supabase } from '@/integrations/supabase/client';
 import { useToast } from '@/components/ui/use-toast';
 
+// Rows per request for the initial load; large tables arrive in pages instead of one response
+const PAGE_SIZE = 500;
+
 export const useRealtimeData = (tableName: string) => {
   const [data, setData] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const { toast } = useToast();
 
   useEffect(() => {
+    let cancelled = false;
+
+    // Stream the table in pages and render each as it lands, rather than waiting on
+    // (and holding) a single response containing every row
     const fetchInitialData = async () => {
       try {
-        const { data: initialData, error } = await supabase
-          .from(tableName as any)
-          .select('*');
-        
-        if (error) {
-          throw error;
-        }
+        for (let from = 0; !cancelled; from += PAGE_SIZE) {
+          const { data: page, error } = await supabase
+            .from(tableName as any)
+            .select('*')
+            // Offset paging needs a stable, unique order or pages can skip or repeat rows
+            .order('id')
+            .range(from, from + PAGE_SIZE - 1);
 
-        setData(initialData || []);
+          if (error) {
+            throw error;
+          }
+
+          const rows = page || [];
+          if (cancelled) break;
+          setData(prev => {
+            if (from === 0) return rows;
+            // Rows a realtime INSERT already delivered between pages are not added twice
+            const seen = new Set(prev.map(item => item.id));
+            return prev.concat(rows.filter(row => !seen.has(row.id)));
+          });
+          if (rows.length < PAGE_SIZE) break;
+        }
       } catch (error) {
         console.error('Error fetching initial data:', error);
         toast({
@@ -27,7 +47,7 @@ export const useRealtimeData = (tableName: string) => {
           variant: "destructive",
         });
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
 
@@ -68,6 +88,7 @@ export const useRealtimeData = (tableName: string) => {
       .subscribe();
 
     return () => {
+      cancelled = true;
       supabase.removeChannel(channel);
     };
   }, [tableName]);
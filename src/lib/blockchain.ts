@@ -46,6 +46,37 @@ export interface Batch {
 
 type EventCallback = (event: BlockchainEvent) => void;
 
+// Role identifiers, as keccak256 hashes of the role names
+const ROLE_IDS = {
+  FARMER_ROLE: ethers.id('FARMER_ROLE'),
+  DISTRIBUTOR_ROLE: ethers.id('DISTRIBUTOR_ROLE'),
+  RETAILER_ROLE: ethers.id('RETAILER_ROLE'),
+  CONSUMER_ROLE: ethers.id('CONSUMER_ROLE'),
+};
+
+// Per-QR unique suffix
+const newQrToken: () => string = typeof globalThis.crypto?.randomUUID === 'function'
+  ? () => crypto.randomUUID()
+  : () => `${Date.now()}-${Math.random().toString(36).slice(2, 10)}`;
+
+// Contract status enum -> label, indexed by the on-chain value
+const PRODUCT_STATUSES: readonly string[] = [
+  'Harvested',      // 0
+  'Processed',      // 1
+  'Packed',         // 2
+  'ForSale',        // 3
+  'Sold',           // 4
+  'Shipped',        // 5
+  'Received',       // 6
+  'Purchased'       // 7
+];
+
+// Events retained for getEventHistory; older ones are dropped
+const MAX_EVENT_HISTORY = 1000;
+
+// Block timestamps remembered for event listeners; the oldest lookup is evicted first
+const MAX_BLOCK_TIMESTAMPS = 256;
+
 // Singleton service for blockchain interactions
 class BlockchainService {
   private static instance: BlockchainService;
@@ -54,6 +85,9 @@ class BlockchainService {
   private eventListeners: { [eventName: string]: EventCallback[] } = {};
   private eventHistory: BlockchainEvent[] = [];
   private isListening = false;
+  // Block number -> timestamp lookups, shared by every event listener. Events emitted in the
+  // same block (e.g. a batch created with its products) then cost a single getBlock call.
+  private blockTimestamps = new Map<number, Promise<number>>();
   private eventSubscriptions: { [key: string]: () => void } = {};
 
   private constructor() {}
@@ -88,6 +122,29 @@ class BlockchainService {
     return this.contract;
   }
 
+  private getBlockTimestamp(provider: BrowserProvider, blockNumber: number): Promise<number> {
+    let timestamp = this.blockTimestamps.get(blockNumber);
+    if (!timestamp) {
+      timestamp = provider.getBlock(blockNumber)
+        .then(block => {
+          if (block?.timestamp) return block.timestamp;
+          // Block not available yet: fall back to local time without caching the guess
+          this.blockTimestamps.delete(blockNumber);
+          return Math.floor(Date.now() / 1000);
+        })
+        .catch((error) => {
+          // Don't cache failures; a later event in this block can retry
+          this.blockTimestamps.delete(blockNumber);
+          throw error;
+        });
+      if (this.blockTimestamps.size >= MAX_BLOCK_TIMESTAMPS) {
+        this.blockTimestamps.delete(this.blockTimestamps.keys().next().value);
+      }
+      this.blockTimestamps.set(blockNumber, timestamp);
+    }
+    return timestamp;
+  }
+
   // Initialize event listeners
   public async startEventListeners() {
     if (this.isListening) return;
@@ -100,12 +157,12 @@ class BlockchainService {
         contract,
         'ProductCreated',
         async (event: any) => {
-          const block = await provider.getBlock(event.log.blockNumber);
+          const timestamp = await this.getBlockTimestamp(provider, event.log.blockNumber);
           return {
             type: 'ProductCreated',
             blockNumber: event.log.blockNumber,
             transactionHash: event.log.transactionHash,
-            timestamp: block?.timestamp || Math.floor(Date.now() / 1000),
+            timestamp,
             data: {
               productId: event.args[0].toString(),
               name: event.args[1],
@@ -121,12 +178,12 @@ class BlockchainService {
         contract,
         'BatchCreated',
         async (event: any) => {
-          const block = await provider.getBlock(event.log.blockNumber);
+          const timestamp = await this.getBlockTimestamp(provider, event.log.blockNumber);
           return {
             type: 'BatchCreated',
             blockNumber: event.log.blockNumber,
             transactionHash: event.log.transactionHash,
-            timestamp: block?.timestamp || Math.floor(Date.now() / 1000),
+            timestamp,
             data: {
               batchId: event.args[0].toString(),
               productIds: event.args[1].map((id: any) => id.toString()),
@@ -142,12 +199,12 @@ class BlockchainService {
         contract,
         'BatchLocationUpdated',
         async (event: any) => {
-          const block = await provider.getBlock(event.log.blockNumber);
+          const timestamp = await this.getBlockTimestamp(provider, event.log.blockNumber);
           return {
             type: 'BatchLocationUpdated',
             blockNumber: event.log.blockNumber,
             transactionHash: event.log.transactionHash,
-            timestamp: block?.timestamp || Math.floor(Date.now() / 1000),
+            timestamp,
             data: {
               batchId: event.args[0].toString(),
               newLocation: event.args[1],
@@ -162,12 +219,12 @@ class BlockchainService {
         contract,
         'BatchPurchased',
         async (event: any) => {
-          const block = await provider.getBlock(event.log.blockNumber);
+          const timestamp = await this.getBlockTimestamp(provider, event.log.blockNumber);
           return {
             type: 'BatchPurchased',
             blockNumber: event.log.blockNumber,
             transactionHash: event.log.transactionHash,
-            timestamp: block?.timestamp || Math.floor(Date.now() / 1000),
+            timestamp,
             data: {
               batchId: event.args[0].toString(),
               buyer: event.args[1],
@@ -183,12 +240,12 @@ class BlockchainService {
         contract,
         'OwnershipTransferred',
         async (event: any) => {
-          const block = await provider.getBlock(event.log.blockNumber);
+          const timestamp = await this.getBlockTimestamp(provider, event.log.blockNumber);
           return {
             type: 'OwnershipTransferred',
             blockNumber: event.log.blockNumber,
             transactionHash: event.log.transactionHash,
-            timestamp: block?.timestamp || Math.floor(Date.now() / 1000),
+            timestamp,
             data: {
               productId: event.args[0].toString(),
               previousOwner: event.args[1],
@@ -246,9 +303,9 @@ class BlockchainService {
     return Number(count);
   }
 
-  // Get event history
+  // Get event history, newest first
   public getEventHistory(): BlockchainEvent[] {
-    return [...this.eventHistory];
+    return this.eventHistory.slice().reverse();
   }
 
   // Helper to wire event listener
@@ -261,7 +318,9 @@ class BlockchainService {
       try {
         const event = args[args.length - 1] as EventLog;
         const formatted = await transform({ args: event.args, log: event });
-        this.eventHistory = [formatted, ...this.eventHistory];
+        // Stored oldest-first so each event is an append, not a copy of the whole history
+        this.eventHistory.push(formatted);
+        if (this.eventHistory.length > MAX_EVENT_HISTORY) this.eventHistory.shift();
         if (this.eventListeners[eventName]) {
           this.eventListeners[eventName].forEach(cb => cb(formatted));
         }
@@ -317,19 +376,19 @@ class BlockchainService {
 
   // Add role constants
   get FARMER_ROLE() {
-    return ethers.id('FARMER_ROLE');
+    return ROLE_IDS.FARMER_ROLE;
   }
 
   get DISTRIBUTOR_ROLE() {
-    return ethers.id('DISTRIBUTOR_ROLE');
+    return ROLE_IDS.DISTRIBUTOR_ROLE;
   }
 
   get RETAILER_ROLE() {
-    return ethers.id('RETAILER_ROLE');
+    return ROLE_IDS.RETAILER_ROLE;
   }
 
   get CONSUMER_ROLE() {
-    return ethers.id('CONSUMER_ROLE');
+    return ROLE_IDS.CONSUMER_ROLE;
   }
 
   async getCurrentAccount(): Promise<string | null> {
@@ -422,29 +481,19 @@ class BlockchainService {
   }
 
   getProductStatus(status: number): string {
-    const statuses = [
-      'Harvested',      // 0
-      'Processed',      // 1
-      'Packed',         // 2
-      'ForSale',        // 3
-      'Sold',           // 4
-      'Shipped',        // 5
-      'Received',       // 6
-      'Purchased'       // 7
-    ];
-    return statuses[status] || 'Unknown';
+    return PRODUCT_STATUSES[status] || 'Unknown';
   }
 
   // QR Code generation utilities
   generateProductQRCode(productId: number): string {
     const externalBase = 'https://krishtisetu.vercel.app';
-    const unique = (globalThis as any).crypto && (crypto as any).randomUUID ? (crypto as any).randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2, 10)}`;
+    const unique = newQrToken();
     return `${externalBase}/p/${productId}/${unique}`;
   }
 
   generateBatchQRCode(batchId: number): string {
     const externalBase = 'https://krishtisetu.vercel.app';
-    const unique = (globalThis as any).crypto && (crypto as any).randomUUID ? (crypto as any).randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2, 10)}`;
+    const unique = newQrToken();
     return `${externalBase}/b/${batchId}/${unique}`;
   }
 
@@ -6,7 +6,7 @@ import { Separator } from '@/components/ui/separator';
 import { Skeleton } from '@/components/ui/skeleton';
 import { Alert, AlertDescription, AlertTitle } from '@/components/ui/alert';
 import { ShieldCheck, MapPin, Calendar, Store, Truck, IndianRupee, Star, User } from 'lucide-react';
-import { getBatch, getProduct, getProductStatus, verifyProduct, generateQRCodeDataURL } from '@/lib/blockchain';
+import { getProductStatus, verifyProduct } from '@/lib/blockchain';
 import { useBlockchain } from '@/hooks/useBlockchain';
 
 type RouteParams = {
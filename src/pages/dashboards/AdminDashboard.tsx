@@ -7,8 +7,6 @@ import { Button } from '@/components/ui/button';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Badge } from '@/components/ui/badge';
-import { Input } from '@/components/ui/input';
-import { Label } from '@/components/ui/label';
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@/components/ui/table';
 import { Progress } from '@/components/ui/progress';
 import { Separator } from '@/components/ui/separator';
@@ -20,7 +18,6 @@ import {
 import { 
   BarChart as BarChartIcon, 
   LineChart as LineChartIcon, 
-  PieChart as PieChartIcon, 
   TrendingUp, 
   Users, 
   ShieldAlert, 
@@ -34,6 +31,67 @@ import {
   RefreshCw
 } from 'lucide-react';
 
+// Mock data for demonstration
+const marketTrends = [
+  { date: 'Jan 2023', wheat: 2500, rice: 3000, vegetables: 1800, fruits: 2200 },
+  { date: 'Feb 2023', wheat: 2700, rice: 2800, vegetables: 1900, fruits: 2300 },
+  { date: 'Mar 2023', wheat: 2900, rice: 2600, vegetables: 2100, fruits: 2500 },
+  { date: 'Apr 2023', wheat: 3100, rice: 2700, vegetables: 2300, fruits: 2700 },
+  { date: 'May 2023', wheat: 3300, rice: 2900, vegetables: 2500, fruits: 2900 },
+  { date: 'Jun 2023', wheat: 3500, rice: 3100, vegetables: 2700, fruits: 3100 },
+  { date: 'Jul 2023', wheat: 3300, rice: 3300, vegetables: 2900, fruits: 3300 },
+  { date: 'Aug 2023', wheat: 3100, rice: 3500, vegetables: 3100, fruits: 3500 },
+  { date: 'Sep 2023', wheat: 2900, rice: 3700, vegetables: 3300, fruits: 3700 },
+  { date: 'Oct 2023', wheat: 2700, rice: 3900, vegetables: 3500, fruits: 3900 },
+  { date: 'Nov 2023', wheat: 2500, rice: 4100, vegetables: 3700, fruits: 4100 },
+  { date: 'Dec 2023', wheat: 2300, rice: 4300, vegetables: 3900, fruits: 4300 },
+];
+
+const cropDistribution = [
+  { name: 'Wheat', value: 35 },
+  { name: 'Rice', value: 30 },
+  { name: 'Vegetables', value: 20 },
+  { name: 'Fruits', value: 15 },
+];
+
+const stakeholderDistribution = [
+  { name: 'Farmers', value: 45 },
+  { name: 'Distributors', value: 25 },
+  { name: 'Retailers', value: 20 },
+  { name: 'Consumers', value: 10 },
+];
+
+const regionDistribution = [
+  { name: 'North', value: 30 },
+  { name: 'South', value: 25 },
+  { name: 'East', value: 20 },
+  { name: 'West', value: 25 },
+];
+
+const fraudAlerts = [
+  { id: 1, type: 'QR Code Tampering', location: 'Delhi', status: 'Investigating', date: '2023-12-01', severity: 'High' },
+  { id: 2, type: 'False Origin Claims', location: 'Mumbai', status: 'Resolved', date: '2023-11-28', severity: 'Medium' },
+  { id: 3, type: 'Duplicate Blockchain Entry', location: 'Bangalore', status: 'Confirmed', date: '2023-11-25', severity: 'High' },
+  { id: 4, type: 'Price Manipulation', location: 'Chennai', status: 'Resolved', date: '2023-11-20', severity: 'Low' },
+  { id: 5, type: 'Quantity Mismatch', location: 'Kolkata', status: 'Investigating', date: '2023-11-15', severity: 'Medium' },
+];
+
+const impactMetrics = [
+  { metric: 'Farmers with 30%+ Income Increase', value: 68, change: '+12%', trend: 'up' },
+  { metric: 'Average Supply Chain Transparency', value: 92, change: '+15%', trend: 'up' },
+  { metric: 'Reduction in Food Wastage', value: 23, change: '-23%', trend: 'up' },
+  { metric: 'Consumer Trust Score', value: 87, change: '+9%', trend: 'up' },
+  { metric: 'Fair Price Compliance', value: 94, change: '+7%', trend: 'up' },
+];
+
+const cropRecommendations = [
+  { crop: 'Organic Wheat', region: 'Punjab, Haryana', demand: 'High', price: '₹2,500/quintal', roi: '+25%' },
+  { crop: 'Basmati Rice', region: 'Uttar Pradesh, Punjab', demand: 'Very High', price: '₹3,800/quintal', roi: '+32%' },
+  { crop: 'Tomatoes', region: 'Maharashtra, Karnataka', demand: 'Medium', price: '₹1,800/quintal', roi: '+18%' },
+  { crop: 'Apples', region: 'Himachal Pradesh, Kashmir', demand: 'High', price: '₹4,500/quintal', roi: '+28%' },
+  { crop: 'Organic Pulses', region: 'Madhya Pradesh, Rajasthan', demand: 'High', price: '₹7,200/quintal', roi: '+30%' },
+];
+
 const AdminDashboard = () => {
   const { user, profile, userRole, loading } = useAuth();
   const navigate = useNavigate();
@@ -50,67 +108,6 @@ const AdminDashboard = () => {
   const [cropFilter, setCropFilter] = useState('all');
   const [regionFilter, setRegionFilter] = useState('all');
   
-  // Mock data for demonstration
-  const marketTrends = [
-    { date: 'Jan 2023', wheat: 2500, rice: 3000, vegetables: 1800, fruits: 2200 },
-    { date: 'Feb 2023', wheat: 2700, rice: 2800, vegetables: 1900, fruits: 2300 },
-    { date: 'Mar 2023', wheat: 2900, rice: 2600, vegetables: 2100, fruits: 2500 },
-    { date: 'Apr 2023', wheat: 3100, rice: 2700, vegetables: 2300, fruits: 2700 },
-    { date: 'May 2023', wheat: 3300, rice: 2900, vegetables: 2500, fruits: 2900 },
-    { date: 'Jun 2023', wheat: 3500, rice: 3100, vegetables: 2700, fruits: 3100 },
-    { date: 'Jul 2023', wheat: 3300, rice: 3300, vegetables: 2900, fruits: 3300 },
-    { date: 'Aug 2023', wheat: 3100, rice: 3500, vegetables: 3100, fruits: 3500 },
-    { date: 'Sep 2023', wheat: 2900, rice: 3700, vegetables: 3300, fruits: 3700 },
-    { date: 'Oct 2023', wheat: 2700, rice: 3900, vegetables: 3500, fruits: 3900 },
-    { date: 'Nov 2023', wheat: 2500, rice: 4100, vegetables: 3700, fruits: 4100 },
-    { date: 'Dec 2023', wheat: 2300, rice: 4300, vegetables: 3900, fruits: 4300 },
-  ];
-
-  const cropDistribution = [
-    { name: 'Wheat', value: 35 },
-    { name: 'Rice', value: 30 },
-    { name: 'Vegetables', value: 20 },
-    { name: 'Fruits', value: 15 },
-  ];
-
-  const stakeholderDistribution = [
-    { name: 'Farmers', value: 45 },
-    { name: 'Distributors', value: 25 },
-    { name: 'Retailers', value: 20 },
-    { name: 'Consumers', value: 10 },
-  ];
-
-  const regionDistribution = [
-    { name: 'North', value: 30 },
-    { name: 'South', value: 25 },
-    { name: 'East', value: 20 },
-    { name: 'West', value: 25 },
-  ];
-
-  const fraudAlerts = [
-    { id: 1, type: 'QR Code Tampering', location: 'Delhi', status: 'Investigating', date: '2023-12-01', severity: 'High' },
-    { id: 2, type: 'False Origin Claims', location: 'Mumbai', status: 'Resolved', date: '2023-11-28', severity: 'Medium' },
-    { id: 3, type: 'Duplicate Blockchain Entry', location: 'Bangalore', status: 'Confirmed', date: '2023-11-25', severity: 'High' },
-    { id: 4, type: 'Price Manipulation', location: 'Chennai', status: 'Resolved', date: '2023-11-20', severity: 'Low' },
-    { id: 5, type: 'Quantity Mismatch', location: 'Kolkata', status: 'Investigating', date: '2023-11-15', severity: 'Medium' },
-  ];
-
-  const impactMetrics = [
-    { metric: 'Farmers with 30%+ Income Increase', value: 68, change: '+12%', trend: 'up' },
-    { metric: 'Average Supply Chain Transparency', value: 92, change: '+15%', trend: 'up' },
-    { metric: 'Reduction in Food Wastage', value: 23, change: '-23%', trend: 'up' },
-    { metric: 'Consumer Trust Score', value: 87, change: '+9%', trend: 'up' },
-    { metric: 'Fair Price Compliance', value: 94, change: '+7%', trend: 'up' },
-  ];
-
-  const cropRecommendations = [
-    { crop: 'Organic Wheat', region: 'Punjab, Haryana', demand: 'High', price: '₹2,500/quintal', roi: '+25%' },
-    { crop: 'Basmati Rice', region: 'Uttar Pradesh, Punjab', demand: 'Very High', price: '₹3,800/quintal', roi: '+32%' },
-    { crop: 'Tomatoes', region: 'Maharashtra, Karnataka', demand: 'Medium', price: '₹1,800/quintal', roi: '+18%' },
-    { crop: 'Apples', region: 'Himachal Pradesh, Kashmir', demand: 'High', price: '₹4,500/quintal', roi: '+28%' },
-    { crop: 'Organic Pulses', region: 'Madhya Pradesh, Rajasthan', demand: 'High', price: '₹7,200/quintal', roi: '+30%' },
-  ];
-
   return (
     <div className="min-h-screen bg-gradient-to-br from-slate-50 via-white to-blue-50 p-6">
       <div className="max-w-7xl mx-auto">
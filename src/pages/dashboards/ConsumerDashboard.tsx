@@ -6,24 +6,83 @@ import { UserRole } from '@/lib/types';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
-import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { Textarea } from '@/components/ui/textarea';
-import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Badge } from '@/components/ui/badge';
-import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
+import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle } from '@/components/ui/dialog';
 import { Progress } from '@/components/ui/progress';
 import { Slider } from '@/components/ui/slider';
 import { cn } from '@/lib/utils';
-import { QrCode, Search, ShieldCheck, Star, ThumbsUp, Leaf, Clock, Truck, History, Heart } from 'lucide-react';
+import { QrCode, Search, ShieldCheck, Star, ThumbsUp, Leaf, Clock, Heart } from 'lucide-react';
 import { 
   verifyProduct, 
   parseQRCodeData,
   type Product
 } from '@/lib/blockchain';
-import { QRCodeGenerator } from '@/components/QRCodeGenerator';
 import { toast } from '@/components/ui/use-toast';
-import { supabase } from '@/integrations/supabase/client';
+
+// Mock data for demonstration
+const recentScans = [
+  { 
+    id: 1, 
+    product: 'Organic Wheat Flour', 
+    brand: 'Nature Harvest',
+    scannedDate: '2023-10-25', 
+    farmer: 'Ramesh Kumar', 
+    origin: 'Madhya Pradesh', 
+    harvestDate: '2023-09-15',
+    farmerShare: '80%',
+    verified: true,
+    journey: [
+      { stage: 'Farm', location: 'Madhya Pradesh', date: '2023-09-15' },
+      { stage: 'Processing', location: 'Agri Distributors', date: '2023-09-20' },
+      { stage: 'Retail', location: 'Fresh Markets', date: '2023-09-25' }
+    ]
+  },
+  { 
+    id: 2, 
+    product: 'Premium Basmati Rice', 
+    brand: 'Golden Fields',
+    scannedDate: '2023-10-20', 
+    farmer: 'Suresh Patel', 
+    origin: 'Punjab', 
+    harvestDate: '2023-09-10',
+    farmerShare: '75%',
+    verified: true,
+    journey: [
+      { stage: 'Farm', location: 'Punjab', date: '2023-09-10' },
+      { stage: 'Processing', location: 'Fresh Distributors', date: '2023-09-15' },
+      { stage: 'Retail', location: 'City Grocers', date: '2023-09-20' }
+    ]
+  },
+];
+
+const savedProducts = [
+  { 
+    id: 101, 
+    product: 'Organic Wheat Flour', 
+    brand: 'Nature Harvest',
+    purchaseDate: '2023-10-25', 
+    expiryDate: '2024-01-25',
+    rating: 5
+  },
+  { 
+    id: 102, 
+    product: 'Premium Basmati Rice', 
+    brand: 'Golden Fields',
+    purchaseDate: '2023-10-20', 
+    expiryDate: '2024-02-20',
+    rating: 4
+  },
+  { 
+    id: 103, 
+    product: 'Fresh Tomatoes', 
+    brand: 'Farm Fresh',
+    purchaseDate: '2023-10-15', 
+    expiryDate: '2023-10-30',
+    rating: 3
+  },
+];
 
 const ConsumerDashboard = () => {
   const { user, profile, userRole, loading } = useAuth();
@@ -50,69 +109,6 @@ const ConsumerDashboard = () => {
     owners?: string[];
   } | null>(null);
   
-  // Mock data for demonstration
-  const recentScans = [
-    { 
-      id: 1, 
-      product: 'Organic Wheat Flour', 
-      brand: 'Nature Harvest',
-      scannedDate: '2023-10-25', 
-      farmer: 'Ramesh Kumar', 
-      origin: 'Madhya Pradesh', 
-      harvestDate: '2023-09-15',
-      farmerShare: '80%',
-      verified: true,
-      journey: [
-        { stage: 'Farm', location: 'Madhya Pradesh', date: '2023-09-15' },
-        { stage: 'Processing', location: 'Agri Distributors', date: '2023-09-20' },
-        { stage: 'Retail', location: 'Fresh Markets', date: '2023-09-25' }
-      ]
-    },
-    { 
-      id: 2, 
-      product: 'Premium Basmati Rice', 
-      brand: 'Golden Fields',
-      scannedDate: '2023-10-20', 
-      farmer: 'Suresh Patel', 
-      origin: 'Punjab', 
-      harvestDate: '2023-09-10',
-      farmerShare: '75%',
-      verified: true,
-      journey: [
-        { stage: 'Farm', location: 'Punjab', date: '2023-09-10' },
-        { stage: 'Processing', location: 'Fresh Distributors', date: '2023-09-15' },
-        { stage: 'Retail', location: 'City Grocers', date: '2023-09-20' }
-      ]
-    },
-  ];
-
-  const savedProducts = [
-    { 
-      id: 101, 
-      product: 'Organic Wheat Flour', 
-      brand: 'Nature Harvest',
-      purchaseDate: '2023-10-25', 
-      expiryDate: '2024-01-25',
-      rating: 5
-    },
-    { 
-      id: 102, 
-      product: 'Premium Basmati Rice', 
-      brand: 'Golden Fields',
-      purchaseDate: '2023-10-20', 
-      expiryDate: '2024-02-20',
-      rating: 4
-    },
-    { 
-      id: 103, 
-      product: 'Fresh Tomatoes', 
-      brand: 'Farm Fresh',
-      purchaseDate: '2023-10-15', 
-      expiryDate: '2023-10-30',
-      rating: 3
-    },
-  ];
-
   const scanQRCode = () => {
     setIsQRScannerOpen(true);
     // In a real app, this would activate the camera for QR scanning
@@ -5,13 +5,12 @@ import { UserRole } from '@/lib/types';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
-import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Badge } from '@/components/ui/badge';
-import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
+import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle } from '@/components/ui/dialog';
 import { cn } from '@/lib/utils';
-import { Package, TrendingUp, QrCode, Truck, BarChart3, DollarSign, ShieldCheck, Search, Loader2 } from 'lucide-react';
+import { Package, TrendingUp, QrCode, Truck, DollarSign, ShieldCheck, Search } from 'lucide-react';
 import { 
   blockchainService, 
   type Batch, 
@@ -19,12 +18,10 @@ import {
   verifyProduct,
   updateBatchLocation,
   generateBatchQRCode,
-  generateQRCodeDataURL,
   parseQRCodeData
 } from '@/lib/blockchain';
 import { QRCodeGenerator } from '@/components/QRCodeGenerator';
 import { toast } from '@/components/ui/use-toast';
-import { supabase } from '@/integrations/supabase/client';
 
 interface ProduceItem {
   id: number;
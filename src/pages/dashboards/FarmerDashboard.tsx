@@ -7,18 +7,13 @@ import { Button } from '@/components/ui/button';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
-import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Textarea } from '@/components/ui/textarea';
 import { Badge } from '@/components/ui/badge';
-import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
-import { Calendar } from '@/components/ui/calendar';
-import { Popover, PopoverContent, PopoverTrigger } from '@/components/ui/popover';
-import { format } from 'date-fns';
+import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle } from '@/components/ui/dialog';
 import { cn } from '@/lib/utils';
-import { CalendarIcon, Tractor, TrendingUp, QrCode, Leaf, BarChart3, DollarSign, Clock, AlertCircle, Plus, Loader2 } from 'lucide-react';
+import { Tractor, TrendingUp, QrCode, Leaf, BarChart3, DollarSign, AlertCircle, Plus, Loader2 } from 'lucide-react';
 import { toast } from '@/components/ui/use-toast';
 import { 
-  createProduct, 
   createBatch, 
   getProduct, 
   getBatch, 
@@ -38,6 +33,25 @@ import { QRCodeGenerator } from '@/components/QRCodeGenerator';
 import { supabase } from '@/integrations/supabase/client';
 import { useBlockchain } from '@/hooks/useBlockchain';
 
+// Contract reads in flight at once while loading products/batches. Each is an eth_call
+// through the user's wallet provider, which rate-limits bursts of thousands.
+const CONTRACT_READ_CONCURRENCY = 8;
+
+// Loads ids 1..count with a small pool of workers, preserving id order. Ids that fail to
+// load (might not exist) come back null.
+const loadAllById = async <T,>(count: number, load: (id: number) => Promise<T>): Promise<(T | null)[]> => {
+  const results: (T | null)[] = new Array(count).fill(null);
+  let next = 0;
+  const worker = async () => {
+    while (next < count) {
+      const i = next++;
+      results[i] = await load(i + 1).catch(() => null);
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(CONTRACT_READ_CONCURRENCY, count) }, worker));
+  return results;
+};
+
 const FarmerDashboard = () => {
   const { user, profile, userRole, loading } = useAuth();
   const navigate = useNavigate();
@@ -125,10 +139,12 @@ const FarmerDashboard = () => {
       
       // Start blockchain event listeners to get real-time updates
       await blockchainService.startEventListeners();
+
+      const accountLc = account.toLowerCase();
       
       // Listen for new products and batches
       blockchainService.on('ProductCreated', async (event) => {
-        if (event.data.farmer.toLowerCase() === account.toLowerCase()) {
+        if (event.data.farmer.toLowerCase() === accountLc) {
           try {
             const product = await getProduct(event.data.productId);
             setProducts(prev => [product, ...prev]);
@@ -143,7 +159,7 @@ const FarmerDashboard = () => {
       });
 
       blockchainService.on('BatchCreated', async (event) => {
-        if (event.data.creator.toLowerCase() === account.toLowerCase()) {
+        if (event.data.creator.toLowerCase() === accountLc) {
           try {
             const batch = await getBatch(event.data.batchId);
             setBatches(prev => [batch, ...prev]);
@@ -166,9 +182,15 @@ const FarmerDashboard = () => {
         }
       });
 
-      // Load existing products and batches
-      await loadExistingProducts(account);
-      await loadExistingBatches(account);
+      // Load existing products and batches. A batch is the farmer's when it holds any of
+      // their products, so the product scan's result decides batch ownership directly.
+      // Both contract scans run at the same time; only the final batch filter waits on
+      // the product ids.
+      const productsLoad = loadExistingProducts(account);
+      await Promise.all([
+        productsLoad,
+        loadExistingBatches(productsLoad.then(products => new Set(products.map(product => product.id)))),
+      ]);
       
     } catch (error) {
       console.error('Error loading farm data:', error);
@@ -182,60 +204,39 @@ const FarmerDashboard = () => {
     }
   };
 
-  const loadExistingProducts = async (account: string) => {
+  const loadExistingProducts = async (account: string): Promise<Product[]> => {
     try {
       // Get product count from contract
       const productCount = await blockchainService.getProductCount();
       
-      const farmerProducts: Product[] = [];
+      const accountLc = account.toLowerCase();
       
-      // Check each product to see if it belongs to this farmer
-      for (let i = 1; i <= productCount; i++) {
-        try {
-          const product = await getProduct(i);
-          if (product.farmer.toLowerCase() === account.toLowerCase()) {
-            farmerProducts.push(product);
-          }
-        } catch (error) {
-          // Product might not exist, continue
-          continue;
-        }
-      }
+      // Fetch products a few at a time rather than one awaited call at a time; ids that
+      // fail to load come back null and are dropped
+      const allProducts = await loadAllById(productCount, getProduct);
+      const farmerProducts = allProducts.filter(
+        (product): product is Product => product !== null && product.farmer.toLowerCase() === accountLc
+      );
       
       setProducts(farmerProducts);
+      return farmerProducts;
     } catch (error) {
       console.error('Error loading existing products:', error);
+      return [];
     }
   };
 
-  const loadExistingBatches = async (account: string) => {
+  const loadExistingBatches = async (farmerProductIdsLoad: Promise<Set<number>>) => {
     try {
       // Get batch count from contract
       const batchCount = await blockchainService.getBatchCount();
       
-      const farmerBatches: Batch[] = [];
-      
-      // Check each batch to see if it belongs to this farmer
-      for (let i = 1; i <= batchCount; i++) {
-        try {
-          const batch = await getBatch(i);
-          // Check if any of the products in this batch belong to this farmer
-          const batchProducts = await Promise.all(
-            batch.productIds.map(id => getProduct(id).catch(() => null))
-          );
-          
-          const hasFarmerProducts = batchProducts.some(product => 
-            product && product.farmer.toLowerCase() === account.toLowerCase()
-          );
-          
-          if (hasFarmerProducts) {
-            farmerBatches.push(batch);
-          }
-        } catch (error) {
-          // Batch might not exist, continue
-          continue;
-        }
-      }
+      // Fetch batches a few at a time; batches that fail to load are dropped
+      const allBatches = await loadAllById(batchCount, getBatch);
+      const farmerProductIds = await farmerProductIdsLoad;
+      const farmerBatches = allBatches.filter(
+        (batch): batch is Batch => batch !== null && batch.productIds.some(id => farmerProductIds.has(id))
+      );
       
       setBatches(farmerBatches);
     } catch (error) {
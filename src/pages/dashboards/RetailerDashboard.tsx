@@ -10,20 +10,17 @@ import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Badge } from '@/components/ui/badge';
-import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
+import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle } from '@/components/ui/dialog';
 import { Progress } from '@/components/ui/progress';
-import { cn } from '@/lib/utils';
-import { Package, TrendingUp, QrCode, BarChart3, DollarSign, ShieldCheck, Search, ShoppingCart, Truck, History } from 'lucide-react';
+import { Package, TrendingUp, QrCode, DollarSign, ShieldCheck, ShoppingCart, Truck, History } from 'lucide-react';
 import { 
   purchaseBatch, 
   verifyProduct, 
   generateProductQRCode,
-  generateQRCodeDataURL,
   parseQRCodeData,
   type Product
 } from '@/lib/blockchain';
 import { QRCodeGenerator } from '@/components/QRCodeGenerator';
-import { supabase } from '@/integrations/supabase/client';
 
 const RetailerDashboard = () => {
   const { user, profile, userRole, loading } = useAuth();
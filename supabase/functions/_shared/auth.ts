@@ -0,0 +1,84 @@
+// Short-lived cache of verified access tokens so repeated calls from the same session on a
+// warm isolate skip the round trip to Supabase Auth. Entries never outlive the token's own
+// `exp` claim, and a signed-out session stays usable here for at most TOKEN_CACHE_TTL_MS.
+const TOKEN_CACHE_MAX = 1000;
+const TOKEN_CACHE_TTL_MS = 30 * 1000;
+const tokenCache = new Map<string, { user: any; expires: number }>();
+
+// Key entries by a digest so raw bearer tokens are not retained in memory
+const tokenKey = async (token: string) => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(token));
+  return btoa(String.fromCharCode(...new Uint8Array(digest)));
+};
+
+const base64UrlBytes = (segment: string) =>
+  Uint8Array.from(atob(segment.replace(/-/g, '+').replace(/_/g, '/')), (c) => c.charCodeAt(0));
+
+// JWT segments are base64url-encoded UTF-8; atob alone would garble non-ASCII claims
+const fromBase64Url = (segment: string) => new TextDecoder().decode(base64UrlBytes(segment));
+
+// Read the `exp` claim (ms) without verifying; only used to bound the cache lifetime
+const tokenExpiry = (token: string): number => {
+  try {
+    const payload = JSON.parse(fromBase64Url(token.split('.')[1]));
+    return typeof payload.exp === 'number' ? payload.exp * 1000 : 0;
+  } catch (_) {
+    return 0;
+  }
+};
+
+// When the project's JWT secret is provided, HS256 access tokens are verified in-process
+// with WebCrypto instead of a round trip to Supabase Auth. Local verification can't see
+// sign-outs, so such a token is accepted until its `exp`. Without the secret every cache miss goes through auth.getUser as before.
+const JWT_SECRET = Deno.env.get('SUPABASE_JWT_SECRET');
+const jwtKey = JWT_SECRET
+  ? crypto.subtle.importKey('raw', new TextEncoder().encode(JWT_SECRET), { name: 'HMAC', hash: 'SHA-256' }, false, ['verify'])
+  : null;
+
+const verifyLocally = async (token: string) => {
+  if (!jwtKey) return undefined;
+  const [header, payload, signature] = token.split('.');
+  if (!header || !payload || !signature) return null;
+  try {
+    if (JSON.parse(fromBase64Url(header)).alg !== 'HS256') return undefined;
+    const valid = await crypto.subtle.verify('HMAC', await jwtKey, base64UrlBytes(signature), new TextEncoder().encode(`${header}.${payload}`));
+    if (!valid) return null;
+    const claims = JSON.parse(fromBase64Url(payload));
+    if (typeof claims.exp !== 'number' || claims.exp * 1000 <= Date.now() || !claims.sub) return null;
+    // Only signed-in user sessions; anon and service keys carry other audiences
+    if (claims.aud !== 'authenticated') return null;
+    // Same shape callers read from auth.getUser
+    return {
+      id: claims.sub,
+      email: claims.email,
+      role: claims.role,
+      app_metadata: claims.app_metadata ?? {},
+      user_metadata: claims.user_metadata ?? {},
+    };
+  } catch (_) {
+    return null;
+  }
+};
+
+export const getUserFromToken = async (supabase: any, token: string) => {
+  const key = await tokenKey(token);
+  const now = Date.now();
+  const cached = tokenCache.get(key);
+  if (cached && cached.expires > now) return cached.user;
+  if (cached) tokenCache.delete(key);
+
+  // `undefined` means the token can't be checked locally (no secret, or not HS256)
+  let user = await verifyLocally(token);
+  if (user === undefined) {
+    const { data, error } = await supabase.auth.getUser(token);
+    user = !error ? data?.user ?? null : null;
+  }
+  if (user) {
+    if (tokenCache.size >= TOKEN_CACHE_MAX) {
+      tokenCache.delete(tokenCache.keys().next().value);
+    }
+    const exp = tokenExpiry(token);
+    tokenCache.set(key, { user, expires: Math.min(now + TOKEN_CACHE_TTL_MS, exp || Infinity) });
+  }
+  return user;
+};
@@ -0,0 +1,11 @@
+// Byte -> two-char hex
+const HEX = Array.from({ length: 256 }, (_, i) => i.toString(16).padStart(2, '0'));
+const encoder = new TextEncoder();
+
+// SHA-256 of the JSON-serialized payload, as lowercase hex
+export const sha256Hex = async (payload: unknown): Promise<string> => {
+  const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', encoder.encode(JSON.stringify(payload))));
+  let hex = '';
+  for (let i = 0; i < digest.length; i++) hex += HEX[digest[i]];
+  return hex;
+};
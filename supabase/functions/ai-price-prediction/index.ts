@@ -1,10 +1,342 @@
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
 import { parse } from "https://deno.land/std@0.168.0/csv/parse.ts";
+import { corsHeaders, jsonHeaders } from "../_shared/cors.ts";
 
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+const supabase = createClient(
+  Deno.env.get('SUPABASE_URL') ?? '',
+  Deno.env.get('SUPABASE_ANON_KEY') ?? ''
+);
+
+const round2 = (n: number) => Math.round(n * 100) / 100;
+
+// Season -> price multiplier, for dataset-backed and heuristic predictions. Unknown
+// seasons fall back to the default passed at the lookup site.
+const DATASET_SEASONALITY = new Map<string, number>([['harvest', 0.92], ['lean', 1.08]]);
+const FALLBACK_SEASONALITY = new Map<string, number>([['harvest', 0.9]]);
+
+// The prediction only reads the median and sample count of the matched prices, so that
+// is all a match keeps; `matchedRows` doubles as the sample count
+type DatasetMatch = { median: number; matchedRows: number; totalRows: number };
+
+// Dataset matches for recently seen (crop, location) pairs. Keeps the isolate from
+// downloading and scanning the CSV again for structurally identical requests.
+const MATCH_CACHE_MAX = 256;
+const MATCH_CACHE_TTL_MS = 10 * 60 * 1000;
+const matchCache = new Map<string, { match: DatasetMatch; expires: number }>();
+
+const getCachedMatch = (key: string): DatasetMatch | null => {
+  const entry = matchCache.get(key);
+  if (!entry) return null;
+  matchCache.delete(key);
+  if (entry.expires < Date.now()) return null;
+  // Re-insert to mark as most recently used
+  matchCache.set(key, entry);
+  return entry.match;
+};
+
+const setCachedMatch = (key: string, match: DatasetMatch) => {
+  if (matchCache.size >= MATCH_CACHE_MAX) {
+    matchCache.delete(matchCache.keys().next().value);
+  }
+  matchCache.set(key, { match, expires: Date.now() + MATCH_CACHE_TTL_MS });
+};
+
+// Column-wise view of the CSV (index 0 is the header row). The parsed rows themselves
+// are not retained.
+type Dataset = {
+  length: number;
+  // Lowercased match keys, dictionary-encoded: each row stores a small integer code into
+  // the list of distinct values
+  commodityNames: string[];
+  commodityCodes: Uint32Array;
+  locationNames: string[];
+  locationCodes: Uint32Array;
+  // Row price (modal, else mid of max/min), NaN when the row has none
+  prices: Float64Array;
+};
+
+// Appends `value` to `names` on first sight and returns its code
+const encode = (codes: Map<string, number>, names: string[], value: string) => {
+  let code = codes.get(value);
+  if (code === undefined) {
+    code = names.length;
+    codes.set(value, code);
+    names.push(value);
+  }
+  return code;
+};
+
+// Parsed dataset, kept for the lifetime of the isolate so warm invocations reuse it. After
+// the TTL it is revalidated against the object's ETag and only re-parsed if it changed.
+const DATASET_TTL_MS = 30 * 60 * 1000;
+// After a failed refresh the previous dataset keeps being served, and the next attempt
+// waits this long rather than every request retrying the download
+const DATASET_RETRY_MS = 60 * 1000;
+let dataset: { value: Dataset; etag: string | null; expires: number } | null = null;
+let datasetLoad: Promise<Dataset | null> | null = null;
+
+type DatasetFetch = { value: Dataset; etag: string | null } | 'unchanged' | null;
+
+// Attempt to load dataset from Supabase Storage bucket 'ml/indian_agri_prices.csv'
+// The Kaggle dataset should be exported/uploaded to this path (CSV)
+const fetchDataset = async (supabase: any, etag: string | null): Promise<DatasetFetch> => {
+  const { data: signed } = await supabase
+    .storage
+    .from('ml')
+    .createSignedUrl('indian_agri_prices.csv', 60);
+
+  if (!signed?.signedUrl) return null;
+  const resp = await fetch(signed.signedUrl, etag ? { headers: { 'If-None-Match': etag } } : undefined);
+  if (resp.status === 304) return 'unchanged';
+  if (!resp.ok) return null;
+
+  const csvText = await resp.text();
+  return { value: await parseDataset(csvText), etag: resp.headers.get('ETag') };
+};
+
+const parseDataset = async (csvText: string): Promise<Dataset> => {
+  const records = await parse(csvText, { skipFirstRow: false });
+  // Records may be array of arrays (no header). Infer columns by common Kaggle headers.
+  // Expected headers like: State, District, Market, Commodity, Variety, Arrival_Date, Min_Price, Max_Price, Modal_Price
+  // We'll map indices by locating header row
+  let rows: any[] = records as any[];
+  if (!Array.isArray(rows) || rows.length === 0) throw new Error('Empty CSV');
+
+  const header = rows[0].map((h: string) => String(h).trim().toLowerCase());
+  const idxCommodity = header.findIndex((h: string) => h.includes('commodity') || h.includes('crop') || h === 'commodityname');
+  const idxState = header.findIndex((h: string) => h.includes('state'));
+  const idxDistrict = header.findIndex((h: string) => h.includes('district'));
+  const idxMarket = header.findIndex((h: string) => h.includes('market'));
+  const idxModal = header.findIndex((h: string) => h.includes('modal') && h.includes('price'));
+  const idxMax = header.findIndex((h: string) => h === 'max_price' || h.includes('max'));
+  const idxMin = header.findIndex((h: string) => h === 'min_price' || h.includes('min'));
+  const lower = (r: any[], idx: number) => idx >= 0 ? String(r[idx] || '').toLowerCase() : '';
+
+  // State/district/market are joined with a newline, which a location token (split on
+  // whitespace) can never contain, so a token still only matches within one field.
+  const commodityNames: string[] = [];
+  const locationNames: string[] = [];
+  const commodityIndex = new Map<string, number>();
+  const locationIndex = new Map<string, number>();
+  const commodityCodes = new Uint32Array(rows.length);
+  const locationCodes = new Uint32Array(rows.length);
+  const prices = new Float64Array(rows.length).fill(NaN);
+  for (let i = 1; i < rows.length; i++) {
+    const r = rows[i];
+    commodityCodes[i] = encode(commodityIndex, commodityNames, lower(r, idxCommodity));
+    locationCodes[i] = encode(locationIndex, locationNames, `${lower(r, idxState)}\n${lower(r, idxDistrict)}\n${lower(r, idxMarket)}`);
+    let price = idxModal >= 0 ? Number(r[idxModal]) : NaN;
+    if (Number.isNaN(price) && idxMax >= 0 && idxMin >= 0) {
+      price = (Number(r[idxMax]) + Number(r[idxMin])) / 2;
+    }
+    prices[i] = price;
+  }
+
+  return { length: rows.length, commodityNames, commodityCodes, locationNames, locationCodes, prices };
+};
+
+// A failed refresh falls back to the dataset already in memory, if any
+const keepStaleDataset = (err: unknown): Dataset | null => {
+  if (dataset) {
+    if (err) console.error('Dataset refresh failed, serving previous copy:', err);
+    dataset = { ...dataset, expires: Date.now() + DATASET_RETRY_MS };
+    return dataset.value;
+  }
+  if (err) throw err;
+  return null;
+};
+
+const getDataset = (supabase: any): Promise<Dataset | null> => {
+  if (dataset && dataset.expires > Date.now()) return Promise.resolve(dataset.value);
+  // Concurrent requests on a cold isolate share one download instead of each fetching the CSV
+  if (!datasetLoad) {
+    datasetLoad = fetchDataset(supabase, dataset?.etag ?? null)
+      .then((result) => {
+        if (result === 'unchanged' && dataset) {
+          dataset = { ...dataset, expires: Date.now() + DATASET_TTL_MS };
+          return dataset.value;
+        }
+        if (!result || result === 'unchanged') return keepStaleDataset(null);
+        // Matches computed against the previous file are stale now
+        if (dataset) matchCache.clear();
+        dataset = { value: result.value, etag: result.etag, expires: Date.now() + DATASET_TTL_MS };
+        return result.value;
+      })
+      .catch((err) => keepStaleDataset(err))
+      .finally(() => {
+        datasetLoad = null;
+      });
+  }
+  return datasetLoad;
+};
+
+// Start the download as soon as the isolate boots so the first request finds it loaded
+// (or in flight) instead of paying for it on the request path. Failures are retried by
+// the next request through getDataset.
+getDataset(supabase).catch((err) => console.error('Dataset warm-up failed:', err));
+
+// k-th smallest value (0-based) by in-place quickselect; expected O(n) versus sorting
+const selectKth = (a: Float64Array, k: number): number => {
+  let lo = 0;
+  let hi = a.length - 1;
+  while (lo < hi) {
+    const pivot = a[(lo + hi) >> 1];
+    let i = lo;
+    let j = hi;
+    while (i <= j) {
+      while (a[i] < pivot) i++;
+      while (a[j] > pivot) j--;
+      if (i <= j) {
+        const t = a[i]; a[i] = a[j]; a[j] = t;
+        i++; j--;
+      }
+    }
+    if (k <= j) hi = j;
+    else if (k >= i) lo = i;
+    else break;
+  }
+  return a[k];
+};
+
+const median = (a: Float64Array): number => {
+  const mid = a.length >> 1;
+  if (a.length % 2) return selectKth(a, mid);
+  // After selecting mid, every element left of it is <= a[mid], so the lower middle is their max
+  const upper = selectKth(a, mid);
+  let lower = a[0];
+  for (let i = 1; i < mid; i++) if (a[i] > lower) lower = a[i];
+  return (lower + upper) / 2;
+};
+
+// Reusable buffer for a scan's matched prices, sized to the dataset so a scan never grows
+// an array or copies it before the median; only the median survives each scan
+let priceScratch = new Float64Array(0);
+
+const matchDatasetPrices = (ds: Dataset, cropLc: string, tokens: string[]): DatasetMatch => {
+  const { length, commodityNames, commodityCodes, locationNames, locationCodes, prices: rowPrices } = ds;
+  // Substring tests run per distinct value; the row scan is then two table lookups
+  const commodityHit = Uint8Array.from(commodityNames, (c) => c !== '' && c.includes(cropLc) ? 1 : 0);
+  const locationHit = Uint8Array.from(locationNames, (l) => tokens.length === 0 || tokens.some(t => l.includes(t)) ? 1 : 0);
+  if (priceScratch.length < length) priceScratch = new Float64Array(length);
+  const prices = priceScratch;
+  let matchedRows = 0;
+  let totalRows = 0;
+  // Row 0 is the header
+  for (let i = 1; i < length; i++) {
+    totalRows++;
+    if (!commodityHit[commodityCodes[i]] || !locationHit[locationCodes[i]]) continue;
+    const price = rowPrices[i];
+    if (!Number.isNaN(price)) prices[matchedRows++] = price;
+  }
+
+  return { median: matchedRows ? median(prices.subarray(0, matchedRows)) : 0, matchedRows, totalRows };
+};
+
+// Persist predictions without holding the response on the write: the client never reads the
+// stored row. On Supabase's edge runtime EdgeRuntime.waitUntil keeps the isolate alive until
+// the insert settles; where it is unavailable (e.g. plain Deno) the write is awaited as before.
+declare const EdgeRuntime: { waitUntil(promise: Promise<unknown>): void } | undefined;
+
+const storePredictions = async (records: Record<string, unknown> | Record<string, unknown>[]) => {
+  const write = Promise.resolve(supabase.from('price_predictions').insert(records))
+    .then(({ error }) => {
+      if (error) console.error('Error storing price prediction:', error);
+    });
+  if (typeof EdgeRuntime !== 'undefined') EdgeRuntime.waitUntil(write);
+  else await write;
+};
+
+// Each distinct (crop, location) in a batch may scan the whole dataset, and the batch is
+// stored as one insert, so its size is bounded
+const MAX_BATCH_PREDICTIONS = 100;
+
+type PredictionInput = { cropName: string; currentPrice: unknown; quantity: unknown; location?: string; season?: string };
+
+// A numeric input may be omitted (treated as 0) but not be something Number() can't read
+const isNumeric = (value: unknown) =>
+  value === undefined || value === null || value === '' || (typeof value !== 'object' && Number.isFinite(Number(value)));
+
+// Why an item can't be predicted and stored, or null if it can. crop_name is NOT NULL,
+// and one bad row would fail the whole batch's multi-row insert.
+const invalidPrediction = (item: any): string | null => {
+  if (item === null || typeof item !== 'object') return 'must be an object';
+  if (typeof item.cropName !== 'string' || !item.cropName.trim()) return 'cropName must be a non-empty string';
+  if (!isNumeric(item.currentPrice)) return 'currentPrice must be a number';
+  if (!isNumeric(item.quantity)) return 'quantity must be a number';
+  return null;
+};
+
+const predict = async ({ cropName, currentPrice, quantity, location, season }: PredictionInput) => {
+  const basePrice = Number(currentPrice) || 0;
+  const qty = Number(quantity) || 0;
+  const tokens = String(location || '').toLowerCase().split(/[,\s]+/).filter(Boolean);
+  const cropLc = String(cropName || '').toLowerCase();
+  // Token order does not affect matching, so sort it to let equivalent locations share an entry
+  const cacheKey = `${cropLc}|${[...tokens].sort().join(',')}`;
+
+  let datasetMedian = 0;
+  let matchedRows = 0;
+  let totalRows = 0;
+  try {
+    let match = getCachedMatch(cacheKey);
+    if (!match) {
+      const ds = await getDataset(supabase);
+      if (ds) {
+        match = matchDatasetPrices(ds, cropLc, tokens);
+        setCachedMatch(cacheKey, match);
+      }
+    }
+    if (match) {
+      datasetMedian = match.median;
+      matchedRows = match.matchedRows;
+      totalRows = match.totalRows;
+    }
+  } catch (_) {
+    // ignore dataset load errors, will fall back to heuristic
+  }
+
+  // Compute prediction
+  let predictedPrice = basePrice;
+  let confidenceScore = 0.65;
+  let factors: Record<string, number> = {};
+  if (matchedRows >= 5) {
+    const median = datasetMedian;
+    // Adjust with simple seasonal factor if provided
+    const seasonality = DATASET_SEASONALITY.get(season) ?? 1.0;
+    const quantityFactor = qty > 1000 ? 0.97 : 1.03;
+    predictedPrice = Math.max(0, median * seasonality * quantityFactor);
+    confidenceScore = Math.min(0.98, 0.6 + Math.log10(matchedRows + 1) / 3);
+    factors = { median, seasonality, quantity: quantityFactor, samples: matchedRows } as any;
+  } else {
+    // Fallback heuristic if dataset not available
+    const baseDemand = 1.05;
+    const seasonality = FALLBACK_SEASONALITY.get(season) ?? 1.1;
+    const quantityFactor = qty > 1000 ? 0.95 : 1.05;
+    predictedPrice = (basePrice || 100) * baseDemand * seasonality * quantityFactor;
+    confidenceScore = 0.6;
+    factors = { baseDemand, seasonality, quantity: quantityFactor, samples: matchedRows } as any;
+  }
+
+  const roundedPrice = round2(predictedPrice);
+  const roundedConfidence = round2(confidenceScore);
+
+  return {
+    record: {
+      crop_name: cropName,
+      current_price: basePrice,
+      predicted_price: roundedPrice,
+      confidence_score: roundedConfidence,
+      factors,
+      valid_until: new Date(Date.now() + 24 * 60 * 60 * 1000).toISOString()
+    },
+    result: {
+      predictedPrice: roundedPrice,
+      confidenceScore: roundedConfidence,
+      factors,
+      stats: { matchedRows, totalRows }
+    }
+  };
 };
 
 serve(async (req) => {
@@ -14,120 +346,59 @@ serve(async (req) => {
   }
 
   try {
-    const { cropName, currentPrice, quantity, location, season } = await req.json();
-
-    // Initialize Supabase client
-    const supabaseUrl = Deno.env.get('SUPABASE_URL') ?? '';
-    const anonKey = Deno.env.get('SUPABASE_ANON_KEY') ?? '';
-    const supabase = createClient(supabaseUrl, anonKey);
-
-    // Attempt to load dataset from Supabase Storage bucket 'ml/indian_agri_prices.csv'
-    // The Kaggle dataset should be exported/uploaded to this path (CSV)
-    let datasetPrices: number[] = [];
-    let matchedRows = 0;
-    let totalRows = 0;
-    try {
-      const { data: signed } = await supabase
-        .storage
-        .from('ml')
-        .createSignedUrl('indian_agri_prices.csv', 60);
-
-      if (signed?.signedUrl) {
-        const resp = await fetch(signed.signedUrl);
-        if (resp.ok) {
-          const csvText = await resp.text();
-          const records = await parse(csvText, { skipFirstRow: false });
-          // Records may be array of arrays (no header). Infer columns by common Kaggle headers.
-          // Expected headers like: State, District, Market, Commodity, Variety, Arrival_Date, Min_Price, Max_Price, Modal_Price
-          // We'll map indices by locating header row
-          let rows: any[] = records as any[];
-          if (!Array.isArray(rows) || rows.length === 0) throw new Error('Empty CSV');
-
-          const header = rows[0].map((h: string) => String(h).trim().toLowerCase());
-          const dataRows = rows.slice(1);
-          const idxCommodity = header.findIndex((h: string) => h.includes('commodity') || h.includes('crop') || h === 'commodityname');
-          const idxState = header.findIndex((h: string) => h.includes('state'));
-          const idxDistrict = header.findIndex((h: string) => h.includes('district'));
-          const idxMarket = header.findIndex((h: string) => h.includes('market'));
-          const idxModal = header.findIndex((h: string) => h.includes('modal') && h.includes('price'));
-          const idxMax = header.findIndex((h: string) => h === 'max_price' || h.includes('max'));
-          const idxMin = header.findIndex((h: string) => h === 'min_price' || h.includes('min'));
-
-          const tokens = String(location || '').toLowerCase().split(/[,\s]+/).filter(Boolean);
-          const cropLc = String(cropName || '').toLowerCase();
-
-          for (const r of dataRows) {
-            totalRows++;
-            const commodity = idxCommodity >= 0 ? String(r[idxCommodity] || '').toLowerCase() : '';
-            if (!commodity || !commodity.includes(cropLc)) continue;
-            const state = idxState >= 0 ? String(r[idxState] || '').toLowerCase() : '';
-            const district = idxDistrict >= 0 ? String(r[idxDistrict] || '').toLowerCase() : '';
-            const market = idxMarket >= 0 ? String(r[idxMarket] || '').toLowerCase() : '';
-            const rowMatchesLocation = tokens.length === 0 || tokens.some(t => state.includes(t) || district.includes(t) || market.includes(t));
-            if (!rowMatchesLocation) continue;
-            let price: number | null = null;
-            if (idxModal >= 0) price = Number(r[idxModal]);
-            if ((price == null || Number.isNaN(price)) && idxMax >= 0 && idxMin >= 0) {
-              const max = Number(r[idxMax]);
-              const min = Number(r[idxMin]);
-              if (!Number.isNaN(max) && !Number.isNaN(min)) price = (max + min) / 2;
-            }
-            if (price != null && !Number.isNaN(price)) {
-              datasetPrices.push(price);
-              matchedRows++;
-            }
-          }
+    const body = await req.json();
+
+    // Batch form: { predictions: [...] }. All items share one dataset load and are
+    // persisted with a single multi-row insert instead of one round trip each.
+    if (Array.isArray(body.predictions)) {
+      if (body.predictions.length > MAX_BATCH_PREDICTIONS) {
+        return new Response(
+          JSON.stringify({ error: `At most ${MAX_BATCH_PREDICTIONS} predictions per request` }),
+          { status: 400, headers: jsonHeaders }
+        );
+      }
+      // Validate every item first so a batch is stored whole or not at all
+      for (let i = 0; i < body.predictions.length; i++) {
+        const reason = invalidPrediction(body.predictions[i]);
+        if (reason) {
+          return new Response(
+            JSON.stringify({ error: `predictions[${i}]: ${reason}` }),
+            { status: 400, headers: jsonHeaders }
+          );
         }
       }
-    } catch (_) {
-      // ignore dataset load errors, will fall back to heuristic
+
+      const predictions = await Promise.all(body.predictions.map(predict));
+
+      if (predictions.length > 0) {
+        await storePredictions(predictions.map(p => p.record));
+      }
+
+      return new Response(
+        JSON.stringify({
+          success: true,
+          predictions: predictions.map(p => p.result)
+        }),
+        { headers: jsonHeaders }
+      );
     }
 
-    // Compute prediction
-    let predictedPrice = Number(currentPrice) || 0;
-    let confidenceScore = 0.65;
-    let factors: Record<string, number> = {};
-    if (datasetPrices.length >= 5) {
-      datasetPrices.sort((a, b) => a - b);
-      const mid = Math.floor(datasetPrices.length / 2);
-      const median = datasetPrices.length % 2 ? datasetPrices[mid] : (datasetPrices[mid - 1] + datasetPrices[mid]) / 2;
-      // Adjust with simple seasonal factor if provided
-      const seasonality = season === 'harvest' ? 0.92 : season === 'lean' ? 1.08 : 1.0;
-      const quantityFactor = Number(quantity) > 1000 ? 0.97 : 1.03;
-      predictedPrice = Math.max(0, median * seasonality * quantityFactor);
-      confidenceScore = Math.min(0.98, 0.6 + Math.log10(datasetPrices.length + 1) / 3);
-      factors = { median, seasonality, quantity: quantityFactor, samples: datasetPrices.length } as any;
-    } else {
-      // Fallback heuristic if dataset not available
-      const baseDemand = 1.05;
-      const seasonality = season === 'harvest' ? 0.9 : 1.1;
-      const quantityFactor = Number(quantity) > 1000 ? 0.95 : 1.05;
-      predictedPrice = (Number(currentPrice) || 100) * baseDemand * seasonality * quantityFactor;
-      confidenceScore = 0.6;
-      factors = { baseDemand, seasonality, quantity: quantityFactor, samples: datasetPrices.length } as any;
+    const reason = invalidPrediction(body);
+    if (reason) {
+      return new Response(
+        JSON.stringify({ error: reason }),
+        { status: 400, headers: jsonHeaders }
+      );
     }
 
+    const { record, result } = await predict(body);
+
     // Store prediction in database
-    await supabase
-      .from('price_predictions')
-      .insert({
-        crop_name: cropName,
-        current_price: Number(currentPrice) || 0,
-        predicted_price: Math.round(predictedPrice * 100) / 100,
-        confidence_score: Math.round(confidenceScore * 100) / 100,
-        factors,
-        valid_until: new Date(Date.now() + 24 * 60 * 60 * 1000).toISOString()
-      });
+    await storePredictions(record);
 
     return new Response(
-      JSON.stringify({
-        success: true,
-        predictedPrice: Math.round(predictedPrice * 100) / 100,
-        confidenceScore: Math.round(confidenceScore * 100) / 100,
-        factors,
-        stats: { matchedRows, totalRows }
-      }),
-      { headers: { ...corsHeaders, 'Content-Type': 'application/json' } }
+      JSON.stringify({ success: true, ...result }),
+      { headers: jsonHeaders }
     );
   } catch (error) {
     console.error('Error in ai-price-prediction function:', error);
@@ -135,8 +406,8 @@ serve(async (req) => {
       JSON.stringify({ error: error.message }),
       {
         status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        headers: jsonHeaders,
       }
     );
   }
-});
\ No newline at end of file
+});
@@ -1,11 +1,16 @@
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
-import { crypto } from "https://deno.land/std@0.168.0/crypto/mod.ts";
+import { getUserFromToken } from "../_shared/auth.ts";
+import { sha256Hex } from "../_shared/hash.ts";
+import { corsHeaders, jsonHeaders } from "../_shared/cors.ts";
 
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
-};
+const supabase = createClient(
+  Deno.env.get('SUPABASE_URL') ?? '',
+  Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? ''
+);
+
+// Batch columns needed to validate and price a purchase, plus the owning farmer
+const BATCH_SELECT = 'id,crop_id,quantity,price_per_unit,status,crops:crop_id(farmer_id)';
 
 serve(async (req) => {
   // Handle CORS preflight requests
@@ -19,47 +24,34 @@ serve(async (req) => {
       throw new Error('No authorization header');
     }
 
-    // Initialize Supabase client
-    const supabase = createClient(
-      Deno.env.get('SUPABASE_URL') ?? '',
-      Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? ''
-    );
-
     // Get user from auth header
-    const { data: { user }, error: userError } = await supabase.auth.getUser(
-      authHeader.replace('Bearer ', '')
-    );
+    const user = await getUserFromToken(supabase, authHeader.replace('Bearer ', ''));
 
-    if (userError || !user) {
+    if (!user) {
       throw new Error('Invalid user token');
     }
 
     const { batchId, quantity } = await req.json();
-    
-    // Get buyer profile
-    const { data: buyerProfile } = await supabase
-      .from('profiles')
-      .select('id, role')
-      .eq('user_id', user.id)
-      .single();
+
+    // Get buyer profile and batch (with the owning farmer) in parallel;
+    // neither lookup depends on the other. Only the columns used below are selected.
+    const [{ data: buyerProfile }, { data: batch }] = await Promise.all([
+      supabase
+        .from('profiles')
+        .select('id, role')
+        .eq('user_id', user.id)
+        .single(),
+      supabase
+        .from('batches')
+        .select(BATCH_SELECT)
+        .eq('id', batchId)
+        .single(),
+    ]);
 
     if (!buyerProfile) {
       throw new Error('Buyer profile not found');
     }
 
-    // Get batch with crop and farmer info
-    const { data: batch } = await supabase
-      .from('batches')
-      .select(`
-        *,
-        crops:crop_id (
-          *,
-          profiles:farmer_id (id, first_name, last_name)
-        )
-      `)
-      .eq('id', batchId)
-      .single();
-
     if (!batch || batch.status !== 'available') {
       throw new Error('Batch not available for purchase');
     }
@@ -123,11 +115,7 @@ serve(async (req) => {
       timestamp: new Date().toISOString()
     };
 
-    const encoder = new TextEncoder();
-    const data = encoder.encode(JSON.stringify(blockchainData));
-    const hashBuffer = await crypto.subtle.digest('SHA-256', data);
-    const hashArray = Array.from(new Uint8Array(hashBuffer));
-    const hashHex = hashArray.map(b => b.toString(16).padStart(2, '0')).join('');
+    const hashHex = await sha256Hex(blockchainData);
 
     const { error: blockchainError } = await supabase
       .from('blockchain_records')
@@ -152,7 +140,7 @@ serve(async (req) => {
         message: 'Purchase completed successfully'
       }),
       {
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        headers: jsonHeaders,
       }
     );
   } catch (error) {
@@ -161,7 +149,7 @@ serve(async (req) => {
       JSON.stringify({ error: error.message }),
       {
         status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        headers: jsonHeaders,
       }
     );
   }
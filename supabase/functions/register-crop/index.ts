@@ -1,12 +1,30 @@
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
-import { crypto } from "https://deno.land/std@0.168.0/crypto/mod.ts";
-
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+import { getUserFromToken } from "../_shared/auth.ts";
+import { sha256Hex } from "../_shared/hash.ts";
+import { corsHeaders, jsonHeaders } from "../_shared/cors.ts";
+
+const supabase = createClient(
+  Deno.env.get('SUPABASE_URL') ?? '',
+  Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? ''
+);
+
+// Random base-36 suffixes for batch numbers and QR links. Bytes >= 252 are redrawn so each
+// of the 36 characters is equally likely (252 is the largest multiple of 36 below 256).
+const ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz';
+const randomSuffix = (length: number) => {
+  let out = '';
+  while (out.length < length) {
+    for (const byte of crypto.getRandomValues(new Uint8Array(length))) {
+      if (byte < 252 && out.length < length) out += ALPHABET[byte % 36];
+    }
+  }
+  return out;
 };
 
+// Profile columns read when registering a crop, for both the lookup and the insert fallback
+const PROFILE_SELECT = 'id,role,first_name,last_name,email';
+
 serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
@@ -17,36 +35,31 @@ serve(async (req) => {
     // Validate auth header
     const authHeader = req.headers.get('Authorization') || req.headers.get('authorization');
 
-    // Initialize Supabase client using service role for server-side operations
-    const supabase = createClient(
-      Deno.env.get('SUPABASE_URL') ?? '',
-      Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? ''
-    );
-
     // Resolve user from auth header; require authentication
     let user: any = null;
     if (authHeader && authHeader.startsWith('Bearer ')) {
       const token = authHeader.replace(/^Bearer\s+/i, '');
-      const { data: userData, error: userError } = await supabase.auth.getUser(token);
-      if (!userError && userData?.user) {
-        user = userData.user;
-      }
+      user = await getUserFromToken(supabase, token);
     }
     if (!user?.id) {
-      return new Response(JSON.stringify({ error: 'Authentication required' }), { status: 401, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+      return new Response(JSON.stringify({ error: 'Authentication required' }), { status: 401, headers: jsonHeaders });
     }
 
     const body = await req.json().catch(() => ({}));
     const cropData = body?.cropData ?? body;
     if (!cropData || !cropData.name) {
-      return new Response(JSON.stringify({ error: 'Missing cropData or name' }), { status: 400, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+      return new Response(JSON.stringify({ error: 'Missing cropData or name' }), { status: 400, headers: jsonHeaders });
     }
 
+    const quantity = Number(cropData.quantity) || 0;
+    const unit = cropData.unit || 'kg';
+    const pricePerUnit = Number(cropData.pricePerUnit) || 0;
+
     // Get or create farmer profile for this user
     let profile: any = null;
     const { data: p, error: pErr } = await supabase
       .from('profiles')
-      .select('id, role, first_name, last_name, email')
+      .select(PROFILE_SELECT)
       .eq('user_id', user.id)
       .limit(1)
       .maybeSingle();
@@ -57,21 +70,21 @@ serve(async (req) => {
       const { data: created, error: createErr } = await supabase
         .from('profiles')
         .insert([{ user_id: user.id, email, first_name: '', last_name: '', role: 'farmer' }])
-        .select('id, role, first_name, last_name, email')
+        .select(PROFILE_SELECT)
         .maybeSingle();
       if (createErr) {
         console.error('Profile create error:', createErr);
-        return new Response(JSON.stringify({ error: 'Failed to create profile' }), { status: 500, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+        return new Response(JSON.stringify({ error: 'Failed to create profile' }), { status: 500, headers: jsonHeaders });
       }
       profile = created;
     }
 
     if (!profile || profile.role !== 'farmer') {
-      return new Response(JSON.stringify({ error: 'Only farmers can register crops' }), { status: 403, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+      return new Response(JSON.stringify({ error: 'Only farmers can register crops' }), { status: 403, headers: jsonHeaders });
     }
 
     // Generate batch number
-    const batchNumber = `BATCH-${Date.now()}-${Math.random().toString(36).slice(2, 9)}`;
+    const batchNumber = `BATCH-${Date.now()}-${randomSuffix(7)}`;
 
     // Insert crop (only schema-supported fields)
     const { data: cropRows, error: cropError } = await supabase
@@ -79,9 +92,9 @@ serve(async (req) => {
       .insert([{
         farmer_id: profile.id,
         name: cropData.name,
-        quantity: Number(cropData.quantity) || 0,
-        unit: cropData.unit || 'kg',
-        price_per_unit: Number(cropData.pricePerUnit) || 0,
+        quantity,
+        unit,
+        price_per_unit: pricePerUnit,
         predicted_price: cropData.predictedPrice ?? null,
         description: cropData.description || null,
         harvest_date: cropData.harvestDate || null,
@@ -93,27 +106,34 @@ serve(async (req) => {
 
     if (cropError) {
       console.error('Crop insert error:', cropError);
-      return new Response(JSON.stringify({ error: 'Failed to insert crop', detail: cropError.message ?? cropError }), { status: 500, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+      return new Response(JSON.stringify({ error: 'Failed to insert crop', detail: cropError.message ?? cropError }), { status: 500, headers: jsonHeaders });
     }
     const crop = Array.isArray(cropRows) ? cropRows[0] : cropRows;
 
-    // Create batch with temporary QR
+    // Build public QR URL using our external site. The batch id is generated up front so the
+    // final QR can be written with the insert instead of a follow-up update round trip.
+    const batchId = crypto.randomUUID();
+    const unique = `${Date.now()}-${randomSuffix(8)}`;
+    const qrCode = `https://krishtisetu.vercel.app/b/${encodeURIComponent(batchId)}/${encodeURIComponent(unique)}`;
+
+    // Create batch with its QR
     const { data: batchRows, error: batchError } = await supabase
       .from('batches')
       .insert([{
+        id: batchId,
         crop_id: crop?.id,
         batch_number: batchNumber,
-        qr_code: 'PENDING',
-        quantity: Number(cropData.quantity) || 0,
-        unit: cropData.unit || 'kg',
-        price_per_unit: Number(cropData.pricePerUnit) || 0,
+        qr_code: qrCode,
+        quantity,
+        unit,
+        price_per_unit: pricePerUnit,
         status: 'created'
       }])
       .select();
 
     if (batchError) {
       console.error('Batch insert error:', batchError);
-      return new Response(JSON.stringify({ error: 'Failed to create batch', detail: batchError.message ?? batchError }), { status: 500, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+      return new Response(JSON.stringify({ error: 'Failed to create batch', detail: batchError.message ?? batchError }), { status: 500, headers: jsonHeaders });
     }
 
     const batch = Array.isArray(batchRows) ? batchRows[0] : batchRows;
@@ -121,20 +141,7 @@ serve(async (req) => {
     // Ensure batch exists before referencing id
     if (!batch || !batch.id) {
       console.error('Batch missing after insert:', batchRows);
-      return new Response(JSON.stringify({ error: 'Batch creation returned unexpected result' }), { status: 500, headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
-    }
-
-    // Build public QR URL using our external site and update batch
-    const unique = `${Date.now()}-${Math.random().toString(36).slice(2, 10)}`;
-    const qrCode = `https://krishtisetu.vercel.app/b/${encodeURIComponent(batch.id)}/${encodeURIComponent(unique)}`;
-
-    const { error: updateErr } = await supabase
-      .from('batches')
-      .update({ qr_code: qrCode })
-      .eq('id', batch.id);
-
-    if (updateErr) {
-      console.error('Failed to update batch qr_code:', updateErr);
+      return new Response(JSON.stringify({ error: 'Batch creation returned unexpected result' }), { status: 500, headers: jsonHeaders });
     }
 
     // Create blockchain record (best-effort)
@@ -148,11 +155,7 @@ serve(async (req) => {
         location: crop.location
       };
 
-      const encoder = new TextEncoder();
-      const data = encoder.encode(JSON.stringify(blockchainData));
-      const hashBuffer = await crypto.subtle.digest('SHA-256', data);
-      const hashArray = Array.from(new Uint8Array(hashBuffer));
-      const hashHex = hashArray.map(b => b.toString(16).padStart(2, '0')).join('');
+      const hashHex = await sha256Hex(blockchainData);
 
       const { error: blockchainError } = await supabase
         .from('blockchain_records')
@@ -172,17 +175,17 @@ serve(async (req) => {
         JSON.stringify({
           success: true,
           crop: crop,
-          batch: { ...batch, qr_code: qrCode },
+          batch: batch,
           qrCode: qrCode,
           blockchainHash: hashHex
         }),
         {
-          headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+          headers: jsonHeaders,
         }
       );
     } catch (e) {
       console.error('Error creating blockchain record:', e);
-      return new Response(JSON.stringify({ success: true, crop: crop, batch: { ...batch, qr_code: qrCode }, qrCode }), { headers: { ...corsHeaders, 'Content-Type': 'application/json' } });
+      return new Response(JSON.stringify({ success: true, crop: crop, batch: batch, qrCode }), { headers: jsonHeaders });
     }
   } catch (error) {
     console.error('Error in register-crop function:', error);
@@ -190,7 +193,7 @@ serve(async (req) => {
       JSON.stringify({ error: (error as any)?.message ?? String(error) }),
       {
         status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        headers: jsonHeaders,
       }
     );
   }
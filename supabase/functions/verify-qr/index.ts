@@ -1,9 +1,65 @@
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
+import { corsHeaders, jsonHeaders } from "../_shared/cors.ts";
 
-const corsHeaders = {
-  'Access-Control-Allow-Origin': '*',
-  'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+const supabase = createClient(
+  Deno.env.get('SUPABASE_URL') ?? '',
+  Deno.env.get('SUPABASE_ANON_KEY') ?? ''
+);
+
+const UUID_RE = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Batch with its full supply chain. Related tables select only the columns used to build
+// the verification result. The batch row itself keeps `*`: batches exist in two column
+// layouts (batch_number/quantity/price_per_unit and batch_id/quantity_kg/price_per_kg), and
+// naming a column missing from one would make PostgREST reject the whole query.
+const BATCH_SELECT = `
+  *,
+  crops:crop_id (
+    name,
+    description,
+    quantity,
+    unit,
+    price_per_unit,
+    predicted_price,
+    harvest_date,
+    location,
+    certifications,
+    created_at,
+    farmer:farmer_id (
+      first_name,
+      last_name,
+      phone
+    )
+  ),
+  transactions (
+    quantity,
+    total_price,
+    status,
+    created_at,
+    buyer:buyer_id (
+      first_name,
+      last_name,
+      role
+    )
+  ),
+  blockchain_records (
+    verified,
+    timestamp
+  )
+`.replace(/\s+/g, '');
+
+// Query errors are thrown so they surface as a 500 rather than as an unknown QR code.
+// PGRST116 (several rows) means a QR code shared by more than one batch; it is turned
+// into a 409 below.
+const fetchBatch = async (column: string, value: string) => {
+  const { data, error } = await supabase
+    .from('batches')
+    .select(BATCH_SELECT)
+    .eq(column, value)
+    .maybeSingle();
+  if (error) throw error;
+  return data;
 };
 
 serve(async (req) => {
@@ -16,73 +72,29 @@ serve(async (req) => {
     const { qrCode } = await req.json();
 
     // Normalize and attempt to extract batch id from new URLs like /b/:id/:unique
-    let batchId: number | null = null;
+    let batchId: string | null = null;
     try {
       const url = new URL(qrCode);
       const parts = url.pathname.split('/').filter(Boolean);
       const idx = parts.indexOf('b');
-      if (idx >= 0 && parts[idx + 1]) {
-        const parsed = parseInt(parts[idx + 1]);
-        if (!Number.isNaN(parsed)) batchId = parsed;
-      }
+      const candidate = idx >= 0 ? decodeURIComponent(parts[idx + 1] ?? '') : '';
+      // Batch ids are UUIDs; anything else can only be matched by the full QR code
+      if (UUID_RE.test(candidate)) batchId = candidate;
     } catch (_) {}
 
-    // Initialize Supabase client
-    const supabase = createClient(
-      Deno.env.get('SUPABASE_URL') ?? '',
-      Deno.env.get('SUPABASE_ANON_KEY') ?? ''
-    );
-
-    // Get batch information with full supply chain data
-    const baseSelect = supabase
-      .from('batches')
-      .select(`
-        *,
-        crops:crop_id (
-          *,
-          farmer:farmer_id (
-            id,
-            first_name,
-            last_name,
-            phone,
-            location
-          )
-        ),
-        transactions (
-          *,
-          buyer:buyer_id (
-            id,
-            first_name,
-            last_name,
-            role
-          ),
-          seller:seller_id (
-            id,
-            first_name,
-            last_name
-          )
-        ),
-        blockchain_records (
-          *
-        )
-      `)
-    
-    const { data: batchById } = batchId
-      ? await baseSelect.eq('id', batchId).maybeSingle()
-      : { data: null } as any;
-    
-    const { data: batchByQr } = !batchById
-      ? await baseSelect.eq('qr_code', qrCode).maybeSingle()
-      : { data: null } as any;
-    
-    const batch = batchById || batchByQr;
+    // One round trip in the common case: by primary key when the URL carries an id,
+    // otherwise by QR code. The QR lookup only runs second if the id lookup misses.
+    let batch = await fetchBatch(batchId ? 'id' : 'qr_code', batchId ?? qrCode);
+    if (!batch && batchId) {
+      batch = await fetchBatch('qr_code', qrCode);
+    }
 
     if (!batch) {
       return new Response(
         JSON.stringify({ error: 'QR code not found' }),
         {
           status: 404,
-          headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+          headers: jsonHeaders,
         }
       );
     }
@@ -93,10 +105,11 @@ serve(async (req) => {
     // Farmer registration
     const farmerFirst = batch?.crops?.farmer?.first_name || '';
     const farmerLast = batch?.crops?.farmer?.last_name || '';
+    const farmerName = `${farmerFirst} ${farmerLast}`.trim() || 'Unknown Farmer';
     if (batch?.crops) {
       journey.push({
         step: 'Crop Registration',
-        actor: `${farmerFirst} ${farmerLast}`.trim() || 'Unknown Farmer',
+        actor: farmerName,
         role: 'Farmer',
         timestamp: batch.crops.created_at,
         location: batch.crops.location,
@@ -132,8 +145,8 @@ serve(async (req) => {
     const fairPriceAchieved = predictedPrice ? (farmerPrice >= predictedPrice * 0.9) : true;
 
     // Blockchain verification
-    const blockchainVerified = (batch.blockchain_records || []).length > 0 && 
-                              (batch.blockchain_records || []).every((record: any) => record.verified);
+    const records: any[] = batch.blockchain_records || [];
+    const blockchainVerified = records.length > 0 && records.every((record: any) => record.verified);
 
     const verificationResult = {
       success: true,
@@ -152,17 +165,20 @@ serve(async (req) => {
         certifications: (batch?.crops?.certifications as any) || []
       },
       farmer: {
-        name: `${farmerFirst} ${farmerLast}`.trim() || 'Unknown Farmer',
+        name: farmerName,
         location: batch?.crops?.location || '',
         contact: batch?.crops?.farmer?.phone || ''
       },
       verification: {
         blockchainVerified,
         fairPriceAchieved,
-        recordsCount: batch.blockchain_records.length,
-        lastVerified: batch.blockchain_records[0]?.timestamp
+        recordsCount: records.length,
+        lastVerified: records[0]?.timestamp
       },
-      supplyChain: journey.sort((a: any, b: any) => new Date(a.timestamp as any) as any - new Date(b.timestamp as any) as any),
+      supplyChain: journey
+        .map((step: any) => ({ step, at: new Date(step.timestamp).getTime() }))
+        .sort((a, b) => a.at - b.at)
+        .map(({ step }) => step),
       analytics: {
         farmerPrice: farmerPrice,
         predictedPrice: predictedPrice,
@@ -174,16 +190,25 @@ serve(async (req) => {
     return new Response(
       JSON.stringify(verificationResult),
       {
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        headers: jsonHeaders,
       }
     );
   } catch (error) {
+    if (error?.code === 'PGRST116') {
+      return new Response(
+        JSON.stringify({ error: 'QR code matches more than one batch' }),
+        {
+          status: 409,
+          headers: jsonHeaders,
+        }
+      );
+    }
     console.error('Error in verify-qr function:', error);
     return new Response(
       JSON.stringify({ error: error.message }),
       {
         status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        headers: jsonHeaders,
       }
     );
   }
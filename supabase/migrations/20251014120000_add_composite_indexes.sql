@@ -0,0 +1,14 @@
+-- Composite indexes for the per-user / per-batch listings that are filtered on one
+-- column and ordered by time, so they can be served by a B-tree range scan. price_predictions
+-- gets none: it is only written to, never read by crop.
+CREATE INDEX IF NOT EXISTS idx_transactions_buyer_created ON public.transactions(buyer_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_seller_created ON public.transactions(seller_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_blockchain_records_batch_timestamp ON public.blockchain_records(batch_id, timestamp DESC);
+
+-- The (batch_id, timestamp) index also serves plain batch_id lookups, so the single-column
+-- one would only add write cost to every insert
+DROP INDEX IF EXISTS public.idx_blockchain_records_batch_id;
+
+-- Refresh planner statistics so the new indexes are picked up immediately
+ANALYZE public.transactions;
+ANALYZE public.blockchain_records;
@@ -0,0 +1,32 @@
+-- Backfill price predictions in bulk (e.g. restoring from a dump) with one set-based
+-- INSERT ... SELECT instead of a round trip per row, then refresh planner statistics
+CREATE OR REPLACE FUNCTION public.bulk_load_price_predictions(rows JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SET search_path = ''
+AS $$
+DECLARE
+  inserted INTEGER;
+BEGIN
+  INSERT INTO public.price_predictions (crop_name, current_price, predicted_price, confidence_score, factors, valid_until, created_at)
+  SELECT r.crop_name, r.current_price, r.predicted_price, r.confidence_score, r.factors, r.valid_until, COALESCE(r.created_at, now())
+  FROM jsonb_to_recordset(rows) AS r(
+    crop_name TEXT,
+    current_price DECIMAL,
+    predicted_price DECIMAL,
+    confidence_score DECIMAL,
+    factors JSONB,
+    valid_until TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE
+  );
+  GET DIAGNOSTICS inserted = ROW_COUNT;
+
+  ANALYZE public.price_predictions;
+
+  RETURN inserted;
+END;
+$$;
+
+-- Maintenance only: not callable by anon/authenticated clients
+REVOKE EXECUTE ON FUNCTION public.bulk_load_price_predictions(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_load_price_predictions(JSONB) TO service_role;
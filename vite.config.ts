@@ -19,7 +19,22 @@ export default defineConfig(({ mode }) => ({
       includeAssets: ['favicon.ico', 'pwa-192x192.svg', 'pwa-512x512.svg'],
       strategies: 'generateSW',
       workbox: {
-        globPatterns: ['**/*.{js,css,html,ico,png,svg,jpg}']
+        globPatterns: ['**/*.{js,css,html,ico,png,svg,jpg}'],
+        runtimeCaching: [
+          {
+            // QR images are a pure function of their URL, so serve repeats from the cache. They
+            // load via <img>, so responses are opaque: an error can't be told apart from a hit,
+            // hence revalidating on every use, and browsers pad each opaque entry's quota, hence
+            // the small cap.
+            urlPattern: /^https:\/\/api\.qrserver\.com\/v1\/create-qr-code\//,
+            handler: 'StaleWhileRevalidate',
+            options: {
+              cacheName: 'qr-codes',
+              expiration: { maxEntries: 30, maxAgeSeconds: 7 * 24 * 60 * 60 },
+              cacheableResponse: { statuses: [0, 200] }
+            }
+          }
+        ]
       },
       manifest: {
         name: 'Harvest Link Chain',